@@ -0,0 +1,30 @@
+"""Test fixtures: point the app's database access at an in-memory sqlite engine."""
+import pytest
+import reflex  # noqa: F401  (reflex must be imported before sqlmodel)
+import reflex.model
+import sqlmodel
+from sqlalchemy.pool import StaticPool
+
+from todo import storage
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A fresh in-memory database with the app's tables, used by rx.session()."""
+    engine = sqlmodel.create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    sqlmodel.SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(reflex.model, "get_engine", lambda url=None: engine)
+    yield engine
+    engine.dispose()
+
+
+def texts(items):
+    """The texts of a list of items, for compact assertions."""
+    return [item["text"] for item in items]
+
+
+def spilled_texts(token):
+    """Drain and return the texts of a session's spilled items, oldest first."""
+    return texts(storage.restore(token, 1_000_000))
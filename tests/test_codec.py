@@ -0,0 +1,61 @@
+import pytest
+
+from todo import codec
+
+ITEMS = [
+    {"text": "Write Code", "priority": "Medium"},
+    {"text": "Sleep", "priority": "High"},
+    {"text": "Have Fün", "priority": "Low"},
+] * 50
+
+
+@pytest.mark.parametrize("compression", ["none", "deflate"])
+def test_round_trip(compression):
+    payload = codec.encode_items(ITEMS, compression=compression, threshold=0)
+    assert codec.decode_items(payload) == ITEMS
+
+
+def test_round_trip_zstd():
+    pytest.importorskip("zstandard")
+    payload = codec.encode_items(ITEMS, compression="zstd", threshold=0)
+    assert payload[0] == codec.ZSTD
+    assert codec.decode_items(payload) == ITEMS
+
+
+def test_small_payloads_are_not_compressed():
+    payload = codec.encode_items(ITEMS[:1], compression="deflate", threshold=512)
+    assert payload[0] == codec.RAW
+    assert payload[1:] == b'[["Write Code",1]]'
+
+
+def test_large_payloads_are_compressed():
+    payload = codec.encode_items(ITEMS, compression="deflate", threshold=512)
+    assert payload[0] == codec.DEFLATE
+    assert codec.decode_items(payload) == ITEMS
+
+
+def test_zstd_falls_back_to_deflate_without_zstandard(monkeypatch):
+    monkeypatch.setattr(codec, "zstandard", None)
+    payload = codec.encode_items(ITEMS, compression="zstd", threshold=0)
+    assert payload[0] == codec.DEFLATE
+    assert codec.decode_items(payload) == ITEMS
+
+
+def test_decoding_zstd_without_zstandard_fails(monkeypatch):
+    monkeypatch.setattr(codec, "zstandard", None)
+    with pytest.raises(RuntimeError, match="zstandard"):
+        codec.decode_items(bytes([codec.ZSTD]) + b"data")
+
+
+def test_unknown_priority_decodes_as_medium():
+    payload = codec.encode_items([{"text": "x", "priority": "Urgent"}], compression="none")
+    assert codec.decode_items(payload) == [{"text": "x", "priority": "Medium"}]
+
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError, match="Unknown compression"):
+        codec.encode_items(ITEMS, compression="lzma")
+
+
+def test_empty_payload_decodes_to_no_items():
+    assert codec.decode_items(b"") == []
@@ -0,0 +1,128 @@
+import pytest
+
+from todo import engines
+from todo.engines import BucketedEngine, DatabaseEngine, ListEngine, get_engine
+from tests.conftest import spilled_texts, texts
+
+# The state defaults from refactored_todo.py, deliberately not in priority order.
+DEFAULTS = [
+    {"text": "Write Code", "priority": "Medium"},
+    {"text": "Sleep", "priority": "High"},
+    {"text": "Have Fun", "priority": "Low"},
+]
+
+
+def item(text, priority="Medium"):
+    return {"text": text, "priority": priority}
+
+
+def test_list_engine_keeps_insertion_order(db):
+    engine = ListEngine(max_items=0)
+    items = engine.add("t", DEFAULTS, item("New", "High"))
+    assert texts(items) == ["Write Code", "Sleep", "Have Fun", "New"]
+    items = engine.remove("t", items, DEFAULTS[1])
+    assert texts(items) == ["Write Code", "Have Fun", "New"]
+
+
+def test_list_engine_ignores_missing_item(db):
+    engine = ListEngine(max_items=0)
+    assert engine.remove("t", DEFAULTS, item("Missing")) == DEFAULTS
+
+
+def test_list_engine_spills_oldest_and_restores_them_in_front(db):
+    engine = ListEngine(max_items=3)
+    items = engine.add("t", DEFAULTS, item("New"))
+    assert texts(items) == ["Sleep", "Have Fun", "New"]
+
+    items = engine.add("t", items, item("Newer"))
+    assert texts(items) == ["Have Fun", "New", "Newer"]
+
+    items = engine.remove("t", items, item("New"))
+    assert texts(items) == ["Sleep", "Have Fun", "Newer"]
+    assert spilled_texts("t") == ["Write Code"]
+
+
+def test_bucketed_engine_sorts_unsorted_state_on_load(db):
+    engine = BucketedEngine(max_items=0)
+    assert texts(engine.load("t", DEFAULTS)) == ["Sleep", "Write Code", "Have Fun"]
+
+
+def test_bucketed_engine_adds_after_same_priority(db):
+    engine = BucketedEngine(max_items=0)
+    items = engine.load("t", DEFAULTS)
+    items = engine.add("t", items, item("Deploy", "High"))
+    items = engine.add("t", items, item("Docs", "Low"))
+    items = engine.add("t", items, item("Review", "Medium"))
+    assert texts(items) == ["Sleep", "Deploy", "Write Code", "Review", "Have Fun", "Docs"]
+
+
+def test_bucketed_engine_removes_loaded_items(db):
+    engine = BucketedEngine(max_items=0)
+    items = engine.load("t", DEFAULTS)
+    for default in DEFAULTS:
+        items = engine.remove("t", items, default)
+    assert items == []
+
+
+def test_bucketed_engine_removes_from_unsorted_state(db):
+    engine = BucketedEngine(max_items=0)
+    items = engine.remove("t", DEFAULTS, item("Write Code", "Medium"))
+    assert texts(items) == ["Sleep", "Have Fun"]
+
+
+def test_bucketed_engine_spills_lowest_priority_and_restores_in_order(db):
+    engine = BucketedEngine(max_items=3)
+    items = engine.load("t", DEFAULTS)
+    items = engine.add("t", items, item("Deploy", "High"))
+    assert texts(items) == ["Sleep", "Deploy", "Write Code"]
+
+    items = engine.remove("t", items, item("Sleep", "High"))
+    assert texts(items) == ["Deploy", "Write Code", "Have Fun"]
+    assert spilled_texts("t") == []
+
+
+def test_bucketed_engine_restores_highest_priority_first(db):
+    engine = BucketedEngine(max_items=2)
+    items = engine.load("t", [item("Medium"), item("Low", "Low")])
+    items = engine.add("t", items, item("High 1", "High"))
+    items = engine.add("t", items, item("High 2", "High"))
+    assert texts(items) == ["High 1", "High 2"]
+
+    items = engine.remove("t", items, item("High 1", "High"))
+    assert texts(items) == ["High 2", "Medium"]
+    assert spilled_texts("t") == ["Low"]
+
+
+def test_get_engine_by_name():
+    assert isinstance(get_engine("list"), ListEngine)
+    assert isinstance(get_engine("bucketed"), BucketedEngine)
+
+
+def test_get_engine_rejects_unknown_name():
+    with pytest.raises(ValueError, match="Unknown storage engine"):
+        get_engine("heap")
+    assert "heap" not in engines.ENGINES
+
+
+def test_database_engine_seeds_defaults_on_first_load(db):
+    engine = DatabaseEngine(max_items=0)
+    assert engine.load("t", DEFAULTS) == DEFAULTS
+    assert engine.load("t", DEFAULTS) == DEFAULTS
+
+
+def test_database_engine_does_not_reseed_an_emptied_list(db):
+    engine = DatabaseEngine(max_items=0)
+    items = engine.load("t", DEFAULTS)
+    for default in DEFAULTS:
+        items = engine.remove("t", items, default)
+    assert items == []
+    assert engine.load("t", DEFAULTS) == []
+
+
+def test_database_engine_adds_and_removes_rows(db):
+    engine = DatabaseEngine(max_items=3)
+    items = engine.load("t", DEFAULTS)
+    items = engine.add("t", items, item("New"))
+    assert texts(items) == ["Write Code", "Sleep", "Have Fun"]
+    items = engine.remove("t", items, DEFAULTS[0])
+    assert texts(items) == ["Sleep", "Have Fun", "New"]
@@ -0,0 +1,88 @@
+import argparse
+import os
+
+from todo import loadtest
+
+
+def test_rss_of_this_process_is_read():
+    assert loadtest._rss_mb(os.getpid()) > 0
+
+
+def test_rss_is_unavailable_without_psutil_or_proc(monkeypatch):
+    monkeypatch.setattr(loadtest, "psutil", None)
+    assert loadtest._rss_mb(2**22 + 1) is None
+
+
+def test_report_without_memory_samples_marks_memory_unavailable():
+    args = argparse.Namespace(engine="list", profile=False, clients=1, duration=1.0)
+    report = loadtest.summarize(loadtest.Results(latencies=[0.01]), args)
+    assert report["server_rss_mb"]["peak"] is None
+    assert report["errors"] == 0
+
+
+def gate_args(**overrides):
+    values = dict(engine="list", profile=False, clients=1, duration=2.0, max_error_rate=0.0, max_p95_ms=None)
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 71))
+    assert loadtest._percentile(values, 95) == 67
+    assert loadtest._percentile(values, 99) == 70
+    assert loadtest._percentile(values, 50) == 35
+    assert loadtest._percentile([5.0], 99) == 5.0
+    assert loadtest._percentile([3, 1, 2], 0) == 1
+    assert loadtest._percentile([], 95) == 0.0
+
+
+def test_summarize_reports_throughput_latency_and_error_rate():
+    results = loadtest.Results(
+        latencies=[0.001 * i for i in range(1, 101)],
+        counts={"add": 60, "finish": 40},
+        errors=25,
+        memory=[{"t": 0.0, "rss_mb": 100.0}, {"t": 1.0, "rss_mb": 120.0}, {"t": 2.0, "rss_mb": 110.0}],
+    )
+    report = loadtest.summarize(results, gate_args())
+    assert report["events"] == 100
+    assert report["error_rate"] == 0.2
+    assert report["throughput_per_s"] == 50.0
+    assert report["latency_ms"]["p95"] == 95.0
+    assert report["server_rss_mb"]["peak"] == 120.0
+    assert report["server_rss_mb"]["end"] == 110.0
+
+
+def test_gates_pass_a_clean_run():
+    report = loadtest.summarize(loadtest.Results(latencies=[0.01, 0.02]), gate_args())
+    assert loadtest.check_gates(report, gate_args(max_p95_ms=50)) == []
+
+
+def test_gates_fail_a_run_where_everything_errored():
+    report = loadtest.summarize(loadtest.Results(errors=20), gate_args())
+    failures = loadtest.check_gates(report, gate_args(max_p95_ms=50))
+    assert any("no events" in failure for failure in failures)
+    assert any("error rate" in failure for failure in failures)
+
+
+def test_gates_allow_errors_within_budget():
+    report = loadtest.summarize(loadtest.Results(latencies=[0.01] * 99, errors=1), gate_args())
+    assert loadtest.check_gates(report, gate_args()) != []
+    assert loadtest.check_gates(report, gate_args(max_error_rate=0.05)) == []
+
+
+def test_gates_fail_on_slow_p95():
+    report = loadtest.summarize(loadtest.Results(latencies=[0.2] * 10), gate_args())
+    assert loadtest.check_gates(report, gate_args(max_p95_ms=100.0)) == ["p95 200.0 ms exceeds budget of 100.0 ms"]
+
+
+def test_error_in_detects_alerts_and_error_toasts():
+    error_in = loadtest.SimulatedClient._error_in
+    assert error_in({"delta": {}, "events": [], "final": True}) is None
+    assert error_in({"events": [{"name": "_alert", "payload": {"message": "An error occurred."}}]})
+    assert error_in({"events": [{"name": "_call_script", "payload": {"javascript_code": "toast.error('x')"}}]})
+    assert error_in({"error": "boom"}) == "boom"
+
+
+def test_error_in_ignores_normal_updates():
+    update = {"delta": {"state": {"items": [{"text": "Fix bug", "priority": "High"}]}}, "events": [], "final": True}
+    assert loadtest.SimulatedClient._error_in(update) is None
@@ -0,0 +1,61 @@
+import inspect
+import itertools
+import types
+
+import pytest
+
+from todo import profiling, settings
+
+
+class FakeState:
+    router = types.SimpleNamespace(session=types.SimpleNamespace(client_token="0123456789abcdef"))
+
+
+def handler(self, form_data: dict) -> str:
+    return form_data["new_item"]
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE", True)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE", 1.0)
+    monkeypatch.setattr(settings, "PROFILE_MAX_DUMPS", 2)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "_dump_count", itertools.count())
+    return tmp_path
+
+
+def test_disabled_profiling_returns_handler_unchanged(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE", False)
+    assert profiling.profiled(handler) is handler
+
+
+def test_profiled_call_dumps_profile_and_memory_summary(profile_dir):
+    wrapped = profiling.profiled(handler)
+    assert wrapped(FakeState(), form_data={"new_item": "x"}) == "x"
+
+    profiles = list(profile_dir.glob("*-handler-01234567.prof"))
+    summaries = list(profile_dir.glob("*-handler-01234567.txt"))
+    assert len(profiles) == 1 and len(summaries) == 1
+    summary = summaries[0].read_text()
+    assert "handler: handler" in summary
+    assert "peak traced memory" in summary
+
+
+def test_dumps_stop_at_the_cap(profile_dir):
+    wrapped = profiling.profiled(handler)
+    for _ in range(5):
+        wrapped(FakeState(), form_data={"new_item": "x"})
+    assert len(list(profile_dir.glob("*.prof"))) == 2
+
+
+def test_unsampled_calls_are_not_dumped(profile_dir, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE", 0.0)
+    wrapped = profiling.profiled(handler)
+    assert wrapped(FakeState(), form_data={"new_item": "x"}) == "x"
+    assert list(profile_dir.iterdir()) == []
+
+
+def test_wrapper_keeps_argument_names_for_reflex(profile_dir):
+    wrapped = profiling.profiled(handler)
+    assert inspect.getfullargspec(wrapped).args == ["self", "form_data"]
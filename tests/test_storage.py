@@ -0,0 +1,114 @@
+import pytest
+import reflex as rx
+import sqlmodel
+
+from todo import settings, storage
+from tests.conftest import spilled_texts, texts
+
+
+def item(text, priority="Medium"):
+    return {"text": text, "priority": priority}
+
+
+def test_restore_without_spill_is_empty(db):
+    assert storage.restore("t", 5) == []
+
+
+def test_spill_and_restore_oldest_first(db):
+    storage.spill("t", [item("a"), item("b")])
+    storage.spill("t", [item("c")])
+    assert texts(storage.restore("t", 2)) == ["a", "b"]
+    assert spilled_texts("t") == ["c"]
+
+
+def test_restore_newest_keeps_spill_order(db):
+    storage.spill("t", [item("a"), item("b"), item("c")])
+    assert texts(storage.restore("t", 2, order="newest")) == ["b", "c"]
+    assert spilled_texts("t") == ["a"]
+
+
+def test_each_spill_appends_a_chunk(db):
+    for text in "abc":
+        storage.spill("t", [item(text)])
+    with rx.session() as session:
+        chunks = session.exec(sqlmodel.select(storage.SpilledItems)).all()
+    assert len(chunks) == 3
+
+
+def test_restore_spans_and_splits_chunks(db):
+    storage.spill("t", [item("a"), item("b")])
+    storage.spill("t", [item("c"), item("d")])
+    assert texts(storage.restore("t", 3)) == ["a", "b", "c"]
+    storage.spill("t", [item("e")])
+    assert texts(storage.restore("t", 1, order="newest")) == ["e"]
+    assert spilled_texts("t") == ["d"]
+
+
+def test_restore_newest_across_chunks(db):
+    storage.spill("t", [item("a"), item("b")])
+    storage.spill("t", [item("c")])
+    assert texts(storage.restore("t", 2, order="newest")) == ["b", "c"]
+    assert spilled_texts("t") == ["a"]
+
+
+def test_delete_expired_drops_only_idle_sessions(db):
+    storage.spill("old", [item("a")])
+    storage.spill("new", [item("b")])
+    with rx.session() as session:
+        marker = session.exec(
+            sqlmodel.select(storage.SpillSession).where(storage.SpillSession.token == "old")
+        ).one()
+        marker.touched_at -= settings.SPILL_TTL + 1
+        session.add(marker)
+        session.commit()
+    assert storage.delete_expired() == 1
+    assert spilled_texts("old") == []
+    assert spilled_texts("new") == ["b"]
+
+
+def test_spill_sweeps_expired_sessions(db, monkeypatch):
+    storage.spill("old", [item("a")])
+    monkeypatch.setattr(storage, "_last_cleanup", 0.0)
+    monkeypatch.setattr(settings, "SPILL_TTL", -1.0)
+    storage.spill("new", [item("b")])
+    assert spilled_texts("old") == []
+
+
+def test_restore_by_priority_then_spill_order(db):
+    storage.spill("t", [item("low", "Low"), item("medium")])
+    storage.spill("t", [item("high", "High"), item("medium 2")])
+    assert texts(storage.restore("t", 3, order="priority")) == ["high", "medium", "medium 2"]
+    assert spilled_texts("t") == ["low"]
+
+
+def test_restore_rejects_unknown_order(db):
+    with pytest.raises(ValueError, match="Unknown restore order"):
+        storage.restore("t", 1, order="random")
+
+
+def test_spills_are_per_session(db):
+    storage.spill("t1", [item("a")])
+    storage.spill("t2", [item("b")])
+    assert spilled_texts("t1") == ["a"]
+    assert spilled_texts("t2") == ["b"]
+
+
+def test_rows_round_trip_in_insertion_order(db):
+    storage.add_rows("t", [item("a", "High"), item("b", "Low")])
+    storage.add_rows("other", [item("x")])
+    assert storage.load_rows("t") == [item("a", "High"), item("b", "Low")]
+    assert storage.load_rows("t", limit=1) == [item("a", "High")]
+
+
+def test_seed_rows_only_once_per_session(db):
+    assert storage.seed_rows("t", [item("a")]) is True
+    assert storage.seed_rows("t", [item("b")]) is False
+    assert storage.seed_rows("other", []) is True
+    assert texts(storage.load_rows("t")) == ["a"]
+
+
+def test_delete_row_removes_one_matching_row(db):
+    storage.add_rows("t", [item("a"), item("a"), item("b")])
+    storage.delete_row("t", item("a"))
+    storage.delete_row("t", item("missing"))
+    assert texts(storage.load_rows("t")) == ["a", "b"]
@@ -0,0 +1,62 @@
+"""Compare the compact item encoding against the plain JSON state format.
+
+Run with ``python -m todo.bench_codec [item counts...]``.
+"""
+import json
+import random
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+from todo import codec
+
+_WORDS = ["write", "code", "sleep", "have", "fun", "review", "deploy", "fix", "bug", "docs", "call", "team"]
+
+
+def make_items(count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Generate `count` realistic-looking todo items."""
+    rng = random.Random(seed)
+    priorities = list(codec.PRIORITY_CODES)
+    return [
+        {
+            "text": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 5))).capitalize(),
+            "priority": rng.choice(priorities),
+        }
+        for _ in range(count)
+    ]
+
+
+def _time(func: Callable[[], object], number: int) -> float:
+    """Best-of-five time per call, in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def run(counts: List[int]) -> None:
+    """Print encoded size and encode/decode time for each format and item count."""
+    formats = {"json dicts (current)": None, "compact": "none", "compact+deflate": "deflate"}
+    if codec.zstandard is not None:
+        formats["compact+zstd"] = "zstd"
+
+    print(f"{'items':>6}  {'format':<22}{'bytes':>9}{'ratio':>8}{'encode us':>12}{'decode us':>12}")
+    for count in counts:
+        items = make_items(count)
+        number = max(1, 20000 // count)
+        baseline = json.dumps(items).encode("utf-8")
+        for name, compression in formats.items():
+            if compression is None:
+                encode = lambda: json.dumps(items).encode("utf-8")
+                decode = lambda: json.loads(baseline)
+                size = len(baseline)
+            else:
+                payload = codec.encode_items(items, compression=compression, threshold=0)
+                encode = lambda: codec.encode_items(items, compression=compression, threshold=0)
+                decode = lambda: codec.decode_items(payload)
+                size = len(payload)
+            print(
+                f"{count:>6}  {name:<22}{size:>9}{size / len(baseline):>8.2f}"
+                f"{_time(encode, number):>12.1f}{_time(decode, number):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 10000])
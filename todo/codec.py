@@ -0,0 +1,82 @@
+"""Compact encoding for serialized todo items.
+
+Items are stored as key-less ``[text, priority_code]`` pairs instead of
+``{"text", "priority"}`` dicts, and the payload is compressed once it grows
+past ``settings.COMPRESS_THRESHOLD`` bytes. The first byte of every encoded
+payload records how the rest of it is stored.
+"""
+import json
+import zlib
+from typing import Dict, List, Tuple
+
+from todo import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, deflate is always available.
+    zstandard = None
+
+# Priority names mapped to the small integer codes used on the wire.
+PRIORITY_CODES: Dict[str, int] = {"Low": 0, "Medium": 1, "High": 2}
+PRIORITY_NAMES: Dict[int, str] = {code: name for name, code in PRIORITY_CODES.items()}
+DEFAULT_PRIORITY_CODE: int = PRIORITY_CODES["Medium"]
+
+# Format markers stored in the first byte of an encoded payload.
+RAW = 0
+DEFLATE = 1
+ZSTD = 2
+
+_METHODS: Dict[str, int] = {"none": RAW, "deflate": DEFLATE, "zstd": ZSTD}
+
+
+def pack_items(items: List[Dict[str, str]]) -> List[Tuple[str, int]]:
+    """Convert item dictionaries to key-less (text, priority_code) pairs."""
+    return [
+        (item.get("text", ""), PRIORITY_CODES.get(item.get("priority", "Medium"), DEFAULT_PRIORITY_CODE))
+        for item in items
+    ]
+
+
+def unpack_items(rows: List[Tuple[str, int]]) -> List[Dict[str, str]]:
+    """Convert (text, priority_code) pairs back to item dictionaries."""
+    return [
+        {"text": text, "priority": PRIORITY_NAMES.get(code, "Medium")}
+        for text, code in rows
+    ]
+
+
+def encode_items(
+    items: List[Dict[str, str]],
+    compression: str = settings.COMPRESSION,
+    threshold: int = settings.COMPRESS_THRESHOLD,
+) -> bytes:
+    """Encode items compactly, compressing payloads of at least `threshold` bytes.
+
+    Falls back to deflate when zstd is requested but `zstandard` is not installed.
+    """
+    if compression not in _METHODS:
+        raise ValueError(f"Unknown compression {compression!r}, expected one of {sorted(_METHODS)}")
+    body = json.dumps(pack_items(items), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    method = _METHODS[compression]
+    if method == RAW or len(body) < threshold:
+        return bytes([RAW]) + body
+    if method == ZSTD and zstandard is not None:
+        return bytes([ZSTD]) + zstandard.ZstdCompressor().compress(body)
+    return bytes([DEFLATE]) + zlib.compress(body)
+
+
+def decode_items(payload: bytes) -> List[Dict[str, str]]:
+    """Decode a payload produced by `encode_items`."""
+    if not payload:
+        return []
+    method, body = payload[0], payload[1:]
+    if method == DEFLATE:
+        body = zlib.decompress(body)
+    elif method == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but the zstandard package is not installed")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif method != RAW:
+        raise ValueError(f"Unknown payload format {method}")
+    return unpack_items(json.loads(body.decode("utf-8")))
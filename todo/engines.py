@@ -0,0 +1,175 @@
+"""Storage engines that decide how a session's todo items are stored and ordered.
+
+The engine is chosen with ``settings.STORAGE_ENGINE``:
+
+- ``list``: items stay in insertion order in the session state.
+- ``bucketed``: items are kept in High > Medium > Low order. Items are placed
+  and found by binary search over the priority buckets.
+- ``database``: every item is a row in the rxconfig.py database and the state
+  only holds a view of the first ``MAX_ITEMS_PER_SESSION`` of them.
+
+The in-state engines spill items past the per-session cap to the database and
+restore them as room frees up (see storage.py).
+"""
+from typing import Dict, List, Type
+
+from todo import settings, storage
+
+Item = Dict[str, str]
+
+# Sort rank of each priority for the bucketed engine, highest priority first.
+PRIORITY_RANK: Dict[str, int] = {"High": 0, "Medium": 1, "Low": 2}
+
+
+def _rank(item: Item) -> int:
+    """Bucket rank of an item, treating unknown priorities as Medium."""
+    return PRIORITY_RANK.get(item.get("priority", "Medium"), 1)
+
+
+def _bucket_start(items: List[Item], rank: int, lo: int = 0) -> int:
+    """Index of the first item ranked at least `rank` in rank-sorted `items`."""
+    hi = len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _rank(items[mid]) < rank:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _bucket_end(items: List[Item], rank: int, lo: int = 0) -> int:
+    """Index just past the last item ranked at most `rank` in rank-sorted `items`."""
+    hi = len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _rank(items[mid]) <= rank:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class StorageEngine:
+    """Base engine: items live in the session state, capped at `max_items`."""
+
+    name: str = ""
+    # Whether the oldest items are spilled past the cap, rather than the last ones.
+    spill_oldest: bool = False
+    # Which spilled items come back first when there is room (see storage.restore).
+    restore_order: str = "oldest"
+
+    def __init__(self, max_items: int = settings.MAX_ITEMS_PER_SESSION):
+        self.max_items = max_items
+
+    def load(self, token: str, items: List[Item]) -> List[Item]:
+        """Return the items to show when a session's page loads."""
+        return items
+
+    def add(self, token: str, items: List[Item], item: Item) -> List[Item]:
+        """Return the session's items with `item` added."""
+        items = list(items)
+        self._insert(items, item)
+        overflow = len(items) - self.max_items
+        if self.max_items and overflow > 0:
+            if self.spill_oldest:
+                storage.spill(token, items[:overflow])
+                del items[:overflow]
+            else:
+                storage.spill(token, items[self.max_items:])
+                del items[self.max_items:]
+        return items
+
+    def remove(self, token: str, items: List[Item], item: Item) -> List[Item]:
+        """Return the session's items with `item` removed."""
+        items = list(items)
+        self._delete(items, item)
+        if self.max_items and len(items) < self.max_items:
+            restored = storage.restore(token, self.max_items - len(items), order=self.restore_order)
+            if self.spill_oldest:
+                # The newest spilled items are the ones just older than the state's head.
+                items[:0] = restored
+            else:
+                for restored_item in restored:
+                    self._insert(items, restored_item)
+        return items
+
+    def _insert(self, items: List[Item], item: Item) -> None:
+        """Insert an item in place."""
+        raise NotImplementedError
+
+    def _delete(self, items: List[Item], item: Item) -> None:
+        """Delete an item in place, ignoring items that are not present."""
+        raise NotImplementedError
+
+
+class ListEngine(StorageEngine):
+    """Plain list in insertion order; the oldest items are spilled past the cap."""
+
+    name = "list"
+    spill_oldest = True
+    restore_order = "newest"
+
+    def _insert(self, items: List[Item], item: Item) -> None:
+        items.append(item)
+
+    def _delete(self, items: List[Item], item: Item) -> None:
+        if item in items:
+            items.remove(item)
+
+
+class BucketedEngine(StorageEngine):
+    """List kept in priority buckets, indexed by binary search on priority rank."""
+
+    name = "bucketed"
+    restore_order = "priority"
+
+    def load(self, token: str, items: List[Item]) -> List[Item]:
+        # The state defaults are not in priority order; the buckets need them to be.
+        return sorted(items, key=_rank)
+
+    def _insert(self, items: List[Item], item: Item) -> None:
+        # Insert after the existing items of the same priority, like a stable sort.
+        items.insert(_bucket_end(items, _rank(item)), item)
+
+    def _delete(self, items: List[Item], item: Item) -> None:
+        rank = _rank(item)
+        start = _bucket_start(items, rank)
+        try:
+            del items[items.index(item, start, _bucket_end(items, rank, start))]
+        except ValueError:
+            # Not in its bucket, e.g. the state was never loaded in order.
+            if item in items:
+                items.remove(item)
+
+
+class DatabaseEngine(StorageEngine):
+    """One database row per item; the state only holds the first `max_items`."""
+
+    name = "database"
+
+    def load(self, token: str, items: List[Item]) -> List[Item]:
+        # Persist the default items on the session's first visit so they can be completed.
+        storage.seed_rows(token, items)
+        return storage.load_rows(token, self.max_items)
+
+    def add(self, token: str, items: List[Item], item: Item) -> List[Item]:
+        storage.add_rows(token, [item])
+        return storage.load_rows(token, self.max_items)
+
+    def remove(self, token: str, items: List[Item], item: Item) -> List[Item]:
+        storage.delete_row(token, item)
+        return storage.load_rows(token, self.max_items)
+
+
+ENGINES: Dict[str, Type[StorageEngine]] = {
+    engine.name: engine for engine in (ListEngine, BucketedEngine, DatabaseEngine)
+}
+
+
+def get_engine(name: str = settings.STORAGE_ENGINE) -> StorageEngine:
+    """Create the storage engine registered under `name`."""
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown storage engine {name!r}, expected one of {sorted(ENGINES)}") from None
@@ -0,0 +1,381 @@
+"""Headless load test that drives the todo app's event handlers over websockets.
+
+Starts the app backend on a local port, connects simulated socket.io clients
+the same way the browser does, and fires a random mix of add/finish events.
+Everything runs on localhost against a throwaway sqlite database, so it works
+offline and leaves the database in rxconfig.py untouched.
+
+    python -m todo.loadtest --engine list --clients 50 --duration 30
+    python -m todo.loadtest --engine bucketed --clients 50 --duration 30 --json out.json
+
+The run exits non-zero when no event completed, when the error rate is above
+``--max-error-rate`` (default 0) or when the p95 latency is above ``--max-p95-ms``.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import socketio
+
+from todo.engines import ENGINES
+
+try:
+    import psutil
+except ImportError:  # Memory is then read from /proc, or reported as unavailable.
+    psutil = None
+
+PRIORITY_WEIGHTS: Dict[str, int] = {"Low": 3, "Medium": 5, "High": 2}
+_WORDS = ["write", "code", "sleep", "have", "fun", "review", "deploy", "fix", "bug", "docs", "call", "team"]
+
+
+class ServerError(Exception):
+    """The server answered an event with an error instead of a normal update."""
+
+
+@dataclass
+class Results:
+    """Measurements collected during a run."""
+
+    latencies: List[float] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    memory: List[Dict[str, float]] = field(default_factory=list)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MiB, or None when it cannot be read here.
+
+    Uses psutil when installed and /proc otherwise.
+    """
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).memory_info().rss / 2**20
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except Exception:  # psutil.Error, or no /proc on this platform.
+        pass
+    return None
+
+
+def _wait_for_server(url: str, timeout: float) -> None:
+    """Poll the backend's ping endpoint until it answers."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}/ping", timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Backend at {url} did not start within {timeout}s")
+            time.sleep(0.25)
+
+
+def serve(port: int) -> None:
+    """Create the database tables and run the app backend with uvicorn (used in the server subprocess)."""
+    import reflex  # noqa: F401  (reflex patches pydantic and must be imported before sqlmodel)
+    import sqlmodel
+    import uvicorn
+    from reflex.model import get_engine
+
+    # Importing the app registers the storage tables, which nothing else
+    # creates for a fresh checkout.
+    from todo.todo import app
+
+    sqlmodel.SQLModel.metadata.create_all(get_engine())
+
+    # Reflex 0.6 sets up the state and mounts the event socket while compiling
+    # the frontend, which needs bun and network access. The headless backend
+    # only needs the state part.
+    app._enable_state()
+
+    # rx.App.__call__ returns the backend ASGI app on the reflex versions pinned in requirements.txt.
+    uvicorn.run(
+        app(),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+
+
+class SimulatedClient:
+    """A single browser-like socket.io client that sends events one at a time."""
+
+    def __init__(self, url: str, names: Dict[str, str], results: Results, args: argparse.Namespace, seed: int):
+        self.url = url
+        self.names = names
+        self.results = results
+        self.args = args
+        self.rng = random.Random(seed)
+        self.token = str(uuid.uuid4())
+        self.items: List[Dict[str, str]] = []
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on("event", self._on_update, namespace=names["namespace"])
+        self._final: Optional[asyncio.Event] = None
+        self._error: Optional[str] = None
+
+    @staticmethod
+    def _error_in(update: Dict[str, Any]) -> Optional[str]:
+        """Describe the server-side error reported by an update, if any.
+
+        Reflex reports handler exceptions as an alert or an error toast event;
+        the app itself never emits alerts or mentions errors in its events.
+        """
+        if update.get("error"):
+            return str(update["error"])
+        for event in update.get("events") or []:
+            if event.get("name", "").endswith("_alert") or "error" in json.dumps(event.get("payload", {})).lower():
+                return json.dumps(event)[:200]
+        return None
+
+    def _on_update(self, data: Any) -> None:
+        """Track the item list and errors from state updates and signal when an event completes."""
+        update = json.loads(data) if isinstance(data, str) else data
+        self._error = self._error or self._error_in(update)
+        for name, value in update.get("delta", {}).get(self.names["state"], {}).items():
+            if name == "items" or name.startswith("items_"):
+                self.items = value
+        if update.get("final", True) and self._final is not None:
+            self._final.set()
+
+    async def send(self, handler: str, payload: Dict[str, Any]) -> float:
+        """Emit an event and wait for its final state update; return the latency in seconds.
+
+        Raises `ServerError` when the server reports that the handler failed.
+        """
+        self._final = asyncio.Event()
+        self._error = None
+        event = {
+            "token": self.token,
+            "name": handler,
+            "router_data": {"pathname": "/", "query": {}, "asPath": "/"},
+            "payload": payload,
+        }
+        start = time.perf_counter()
+        await self.sio.emit("event", event, namespace=self.names["namespace"])
+        await asyncio.wait_for(self._final.wait(), timeout=self.args.timeout)
+        if self._error:
+            raise ServerError(f"{handler}: {self._error}")
+        return time.perf_counter() - start
+
+    def _next_event(self):
+        """Pick the next event following the configured add/finish mix."""
+        if self.items and self.rng.random() < self.args.finish_ratio:
+            return "finish", {"item": self.rng.choice(self.items)}
+        text = " ".join(self.rng.choice(_WORDS) for _ in range(self.rng.randint(1, 5))).capitalize()
+        priority = self.rng.choices(list(PRIORITY_WEIGHTS), weights=list(PRIORITY_WEIGHTS.values()))[0]
+        return "add", {"form_data": {"new_item": text, "priority": priority}}
+
+    async def run(self, deadline: float) -> None:
+        """Connect, hydrate, load the page and fire events until the deadline passes."""
+        await self.sio.connect(
+            self.url,
+            socketio_path=self.names["namespace"],
+            transports=["websocket"],
+            namespaces=[self.names["namespace"]],
+        )
+        try:
+            await self.send(self.names["hydrate"], {})
+            await self.send(self.names["load"], {})
+            while time.monotonic() < deadline:
+                kind, payload = self._next_event()
+                try:
+                    latency = await self.send(self.names[kind], payload)
+                except (asyncio.TimeoutError, ServerError):
+                    self.results.errors += 1
+                    continue
+                self.results.latencies.append(latency)
+                self.results.counts[kind] = self.results.counts.get(kind, 0) + 1
+                if self.args.think_time:
+                    await asyncio.sleep(self.rng.expovariate(1 / self.args.think_time))
+        finally:
+            await self.sio.disconnect()
+
+
+async def _sample_memory(pid: int, results: Results, start: float, deadline: float, interval: float) -> None:
+    """Record the server's RSS every `interval` seconds, stopping if it cannot be read."""
+    while time.monotonic() < deadline:
+        rss = _rss_mb(pid)
+        if rss is None:
+            return
+        results.memory.append({"t": round(time.monotonic() - start, 2), "rss_mb": round(rss, 1)})
+        await asyncio.sleep(interval)
+
+
+async def _drive(url: str, names: Dict[str, str], pid: int, args: argparse.Namespace) -> Results:
+    """Run all simulated clients plus the memory sampler."""
+    results = Results()
+    start = time.monotonic()
+    deadline = start + args.duration
+    sampler = asyncio.create_task(_sample_memory(pid, results, start, deadline, args.memory_interval))
+    clients = [SimulatedClient(url, names, results, args, seed=args.seed + i) for i in range(args.clients)]
+    outcomes = await asyncio.gather(*(client.run(deadline) for client in clients), return_exceptions=True)
+    # Only client failures count as errors; the sampler never fails the run.
+    results.errors += sum(isinstance(outcome, Exception) for outcome in outcomes)
+    await asyncio.gather(sampler, return_exceptions=True)
+    return results
+
+
+def _event_names() -> Dict[str, str]:
+    """Resolve the fully qualified event names the way the frontend does."""
+    import reflex as rx
+    from reflex.config import get_config
+    from todo.refactored_todo import TodoStateManager
+
+    # The UI binds TodoState's handlers and items, which resolve to the
+    # TodoStateManager they are defined on; the empty subclass has none of its own.
+    full_name = TodoStateManager.get_full_name()
+    return {
+        "namespace": get_config().get_event_namespace(),
+        "state": full_name,
+        "hydrate": f"{rx.State.get_full_name()}.hydrate",
+        "load": f"{full_name}.load_items",
+        "add": f"{full_name}.add_todo_item",
+        "finish": f"{full_name}.complete_todo_item",
+    }
+
+
+def summarize(results: Results, args: argparse.Namespace) -> Dict[str, Any]:
+    """Build the report for a finished run."""
+    latencies_ms = [latency * 1000 for latency in results.latencies]
+    rss = [sample["rss_mb"] for sample in results.memory]
+    attempted = len(latencies_ms) + results.errors
+    return {
+        "engine": args.engine,
+        "profile": args.profile,
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "events": len(latencies_ms),
+        "events_by_type": results.counts,
+        "errors": results.errors,
+        "error_rate": round(results.errors / attempted, 4) if attempted else 0.0,
+        "throughput_per_s": round(len(latencies_ms) / args.duration, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies_ms), 2) if latencies_ms else 0.0,
+            "p50": round(_percentile(latencies_ms, 50), 2),
+            "p95": round(_percentile(latencies_ms, 95), 2),
+            "p99": round(_percentile(latencies_ms, 99), 2),
+        },
+        # None when memory could not be read on this platform.
+        "server_rss_mb": {
+            "start": rss[0] if rss else None,
+            "peak": max(rss, default=None),
+            "end": rss[-1] if rss else None,
+            "samples": results.memory,
+        },
+    }
+
+
+def check_gates(report: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Return the reasons a report fails the release gates, if any."""
+    failures = []
+    if report["events"] == 0:
+        failures.append("no events completed")
+    if report["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {report['error_rate']} exceeds budget of {args.max_error_rate}")
+    if args.max_p95_ms is not None and report["latency_ms"]["p95"] > args.max_p95_ms:
+        failures.append(f"p95 {report['latency_ms']['p95']} ms exceeds budget of {args.max_p95_ms} ms")
+    return failures
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary of a report."""
+    latency, rss = report["latency_ms"], report["server_rss_mb"]
+    print(f"engine:      {report['engine']} ({report['clients']} clients, {report['duration_s']}s)")
+    print(f"events:      {report['events']} {report['events_by_type']}, errors: {report['errors']} ({report['error_rate']:.2%})")
+    print(f"throughput:  {report['throughput_per_s']} events/s")
+    print(f"latency ms:  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  mean {latency['mean']}")
+    if rss["peak"] is None:
+        print("server RSS:  unavailable (install psutil)")
+    else:
+        print(f"server RSS:  start {rss['start']} MiB  peak {rss['peak']} MiB  end {rss['end']} MiB")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="list", help="storage engine to serve with")
+    parser.add_argument("--profile", action="store_true", help="run the server with per-request profiling on")
+    parser.add_argument("--clients", type=int, default=20, help="number of simulated websocket clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to generate load for")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--finish-ratio", type=float, default=0.4, help="share of events that finish an item")
+    parser.add_argument("--think-time", type=float, default=0.05, help="mean pause between a client's events, seconds")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds to wait for an event to complete")
+    parser.add_argument("--memory-interval", type=float, default=1.0, help="seconds between RSS samples")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if p95 latency exceeds this many ms")
+    parser.add_argument(
+        "--max-error-rate", type=float, default=0.0, help="fail if more than this share of events errored"
+    )
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Start the backend, run the load and report the results."""
+    args = parse_args(argv)
+    if args.serve:
+        serve(args.port)
+        return 0
+
+    url = f"http://127.0.0.1:{args.port}"
+    # Each run gets its own database so it never writes to rxconfig.py's one and
+    # database-engine runs do not see rows left by earlier runs.
+    db_dir = tempfile.mkdtemp(prefix="todo-loadtest-")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "todo.loadtest", "--serve", "--port", str(args.port)],
+        env={
+            **os.environ,
+            "PYTHONUNBUFFERED": "1",
+            "DB_URL": f"sqlite:///{os.path.join(db_dir, 'loadtest.db')}",
+            "TODO_STORAGE_ENGINE": args.engine,
+            "TODO_PROFILE": "1" if args.profile else "",
+        },
+    )
+    try:
+        _wait_for_server(url, args.startup_timeout)
+        results = asyncio.run(_drive(url, _event_names(), server.pid, args))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    report = summarize(results, args)
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w") as out:
+            json.dump(report, out, indent=2)
+    failures = check_gates(report, args)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Optional per-request profiling of state event handlers.
+
+When ``settings.PROFILE`` is on, a ``settings.PROFILE_SAMPLE`` fraction of calls
+to `profiled` handlers runs under cProfile and tracemalloc, up to
+``settings.PROFILE_MAX_DUMPS`` calls per process. Each profiled call writes two
+files to ``settings.PROFILE_DIR``: a ``.prof`` file (open it with
+``python -m pstats`` or snakeviz) and a ``.txt`` summary with peak memory and
+the top allocation sites. Unsampled calls only pay for one random draw. When
+profiling is off, `profiled` returns the handler unchanged, so it adds no
+overhead.
+"""
+import cProfile
+import functools
+import inspect
+import itertools
+import os
+import random
+import time
+import tracemalloc
+from typing import Callable
+
+from todo import settings
+
+# Number of allocation sites listed in each memory summary.
+TOP_ALLOCATIONS = 15
+
+# Counts profiled calls so dumping stops at settings.PROFILE_MAX_DUMPS.
+_dump_count = itertools.count()
+
+
+def profiled(handler: Callable) -> Callable:
+    """Wrap a state event handler so sampled calls are profiled and dumped to disk."""
+    if not settings.PROFILE:
+        return handler
+
+    @functools.wraps(handler)
+    def wrapper(self, *args, **kwargs):
+        if random.random() >= settings.PROFILE_SAMPLE or next(_dump_count) >= settings.PROFILE_MAX_DUMPS:
+            return handler(self, *args, **kwargs)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            return handler(self, *args, **kwargs)
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            _dump(handler.__name__, self.router.session.client_token, profiler, snapshot, peak, elapsed)
+
+    # Reflex maps event payloads onto the handler's argument names with
+    # inspect.getfullargspec, which ignores __wrapped__ but honours __signature__.
+    wrapper.__signature__ = inspect.signature(handler)
+    return wrapper
+
+
+def _dump(name: str, token: str, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot, peak: int, elapsed: float) -> None:
+    """Write the profile and memory summary of one handler call."""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    base = os.path.join(settings.PROFILE_DIR, f"{time.time_ns()}-{name}-{token[:8]}")
+    profiler.dump_stats(f"{base}.prof")
+    with open(f"{base}.txt", "w") as summary:
+        summary.write(f"handler: {name}\n")
+        summary.write(f"engine: {settings.STORAGE_ENGINE}\n")
+        summary.write(f"wall time: {elapsed * 1000:.3f} ms\n")
+        summary.write(f"peak traced memory: {peak / 1024:.1f} KiB\n\n")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            summary.write(f"{stat}\n")
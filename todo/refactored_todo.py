@@ -2,7 +2,10 @@
 import reflex as rx
 from typing import List, Dict, Any, Optional, Callable, TypeVar, Generic, Union
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+from todo.engines import get_engine
+from todo.profiling import profiled
 
 # --- Domain Models ---
 
@@ -59,21 +62,29 @@ class TodoItem:
 
 # --- State Management ---
 
+# Storage engine shared by all sessions, selected by settings.STORAGE_ENGINE.
+engine = get_engine()
+
 class TodoStateManager(rx.State):
     """Class responsible for managing todo items state."""
     
     # Store items as dictionaries for compatibility with Reflex
-    items: List[Dict[str, str]] = field(default_factory=lambda: [
+    items: List[Dict[str, str]] = [
         {"text": "Write Code", "priority": "Medium"},
         {"text": "Sleep", "priority": "High"},
         {"text": "Have Fun", "priority": "Low"},
-    ])
+    ]
     
     @property
     def todo_items(self) -> List[TodoItem]:
         """Convert stored dictionaries to TodoItem objects."""
         return [TodoItem.from_dict(item) for item in self.items]
     
+    def load_items(self) -> None:
+        """Load the session's items from the configured storage engine."""
+        self.items = engine.load(self.router.session.client_token, self.items)
+    
+    @profiled
     def add_todo_item(self, form_data: Dict[str, str]) -> None:
         """Add a new todo item with validation."""
         new_text = form_data.get("new_item", "")
@@ -83,22 +94,12 @@ class TodoStateManager(rx.State):
         new_item = TodoItem.create(new_text, new_priority)
         
         if new_item:
-            self.items.append(new_item.to_dict())
-            self._sort_items_by_priority()
+            self.items = engine.add(self.router.session.client_token, self.items, new_item.to_dict())
     
+    @profiled
     def complete_todo_item(self, item: Dict[str, str]) -> None:
         """Mark a todo item as completed and remove it."""
-        if item in self.items:
-            self.items.remove(item)
-    
-    def _sort_items_by_priority(self) -> None:
-        """Sort items by priority (High > Medium > Low)."""
-        priority_order = {
-            "High": 0,
-            "Medium": 1,
-            "Low": 2
-        }
-        self.items.sort(key=lambda x: priority_order.get(x.get("priority", "Medium"), 1))
+        self.items = engine.remove(self.router.session.client_token, self.items, item)
 
 
 # --- UI Components ---
@@ -393,9 +394,3 @@ class TodoApp:
 class TodoState(TodoStateManager):
     """The application state."""
     pass
-
-
-# Create app instance and add page
-app = rx.App()
-app.add_page(TodoApp.create_page, title="Todo Manager")
-# Changed from app.compile() to fix the AttributeError
@@ -0,0 +1,36 @@
+"""Tunable settings for the todo app, overridable through environment variables."""
+import os
+
+# Maximum number of items kept in a session's state; 0 disables the cap.
+# Items beyond the cap are spilled to the database configured in rxconfig.py:
+# the list engine spills its oldest items, so a newly added item always shows,
+# and the bucketed engine spills its lowest-priority items. Spilled items come
+# back as other items are completed: the newest ones for the list engine, the
+# highest-priority ones for the bucketed engine.
+MAX_ITEMS_PER_SESSION: int = int(os.environ.get("TODO_MAX_ITEMS", "100"))
+
+# Spilled items of sessions idle for this many seconds are deleted. The default
+# matches reflex's default state expiry, after which the session is gone too.
+SPILL_TTL: float = float(os.environ.get("TODO_SPILL_TTL", "3600"))
+
+# Minimum seconds between two sweeps for expired spills in one process.
+SPILL_CLEANUP_INTERVAL: float = float(os.environ.get("TODO_SPILL_CLEANUP_INTERVAL", "300"))
+
+# Compression used for encoded item payloads: "none", "deflate" or "zstd".
+COMPRESSION: str = os.environ.get("TODO_COMPRESSION", "deflate")
+
+# Payloads smaller than this many bytes are stored uncompressed.
+COMPRESS_THRESHOLD: int = int(os.environ.get("TODO_COMPRESS_THRESHOLD", "512"))
+
+# How session items are stored: "list", "bucketed" or "database" (see engines.py).
+STORAGE_ENGINE: str = os.environ.get("TODO_STORAGE_ENGINE", "list")
+
+# When enabled, sampled event handler calls are profiled with cProfile and
+# tracemalloc, and the results are written to PROFILE_DIR.
+PROFILE: bool = os.environ.get("TODO_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_DIR: str = os.environ.get("TODO_PROFILE_DIR", ".profiles")
+
+# Fraction of handler calls that are profiled, and the most dumps written per
+# process, so profiling under load neither fills the disk nor slows every event.
+PROFILE_SAMPLE: float = float(os.environ.get("TODO_PROFILE_SAMPLE", "0.01"))
+PROFILE_MAX_DUMPS: int = int(os.environ.get("TODO_PROFILE_MAX_DUMPS", "200"))
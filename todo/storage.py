@@ -0,0 +1,191 @@
+"""Database storage for todo items: per-session spill-over and the database engine.
+
+Overflowing items are kept as compactly encoded chunks per client token, and
+the database engine keeps one row per item, both in the database configured by
+``db_url`` in rxconfig.py. Run ``reflex db init`` (or
+``reflex db makemigrations`` and ``reflex db migrate`` on an existing database)
+to create the tables.
+"""
+import itertools
+import time
+
+import reflex as rx
+import sqlmodel
+from typing import Dict, List, Optional
+
+from todo import codec, settings
+
+
+class SpilledItems(rx.Model, table=True):
+    """A chunk of overflow items of a session, stored as an encoded payload.
+
+    Every spill appends new chunks, so spilling never re-encodes what is
+    already stored. All items in a chunk share a priority, so chunks can be
+    restored highest priority first.
+    """
+
+    token: str = sqlmodel.Field(index=True)
+    priority_code: int
+    payload: bytes
+
+
+class SpillSession(rx.Model, table=True):
+    """When a session last spilled or restored items, for expiring stale spills."""
+
+    token: str = sqlmodel.Field(index=True, unique=True)
+    touched_at: float
+
+
+# When this process last deleted expired spills.
+_last_cleanup: float = 0.0
+
+# Chunk ordering for each restore order.
+_RESTORE_ORDERS = {
+    "oldest": (SpilledItems.id,),
+    "newest": (SpilledItems.id.desc(),),
+    "priority": (SpilledItems.priority_code.desc(), SpilledItems.id),
+}
+
+
+def _touch(session, token: str, now: float) -> None:
+    """Record that a session's spill is in use."""
+    marker = session.exec(sqlmodel.select(SpillSession).where(SpillSession.token == token)).first()
+    if marker is None:
+        marker = SpillSession(token=token, touched_at=now)
+    marker.touched_at = now
+    session.add(marker)
+
+
+def delete_expired(ttl: Optional[float] = None, now: Optional[float] = None) -> int:
+    """Delete the spills of sessions untouched for `ttl` seconds; return how many sessions expired.
+
+    `ttl` defaults to ``settings.SPILL_TTL``.
+    """
+    ttl = settings.SPILL_TTL if ttl is None else ttl
+    cutoff = (time.time() if now is None else now) - ttl
+    with rx.session() as session:
+        expired = session.exec(
+            sqlmodel.select(SpillSession.token).where(SpillSession.touched_at < cutoff)
+        ).all()
+        if expired:
+            session.exec(sqlmodel.delete(SpilledItems).where(SpilledItems.token.in_(expired)))
+            session.exec(sqlmodel.delete(SpillSession).where(SpillSession.token.in_(expired)))
+            session.commit()
+        return len(expired)
+
+
+def spill(token: str, overflow: List[Dict[str, str]]) -> None:
+    """Append overflowing items to the session's spill, one chunk per run of equal priority."""
+    global _last_cleanup
+    if not overflow:
+        return
+    now = time.time()
+    with rx.session() as session:
+        runs = itertools.groupby(
+            overflow,
+            key=lambda item: codec.PRIORITY_CODES.get(item.get("priority", "Medium"), codec.DEFAULT_PRIORITY_CODE),
+        )
+        for priority_code, run in runs:
+            session.add(SpilledItems(token=token, priority_code=priority_code, payload=codec.encode_items(list(run))))
+        _touch(session, token, now)
+        session.commit()
+    if now - _last_cleanup >= settings.SPILL_CLEANUP_INTERVAL:
+        _last_cleanup = now
+        delete_expired(now=now)
+
+
+def restore(token: str, count: int, order: str = "oldest") -> List[Dict[str, str]]:
+    """Remove and return up to `count` spilled items for a session.
+
+    `order` picks which items come back: "oldest" or "newest" (both returned in
+    spill order), or "priority" (highest priority first, then in spill order).
+    Only the chunks the items come from are read.
+    """
+    if order not in _RESTORE_ORDERS:
+        raise ValueError(f"Unknown restore order {order!r}, expected one of {sorted(_RESTORE_ORDERS)}")
+    if count <= 0:
+        return []
+    newest = order == "newest"
+    restored: List[Dict[str, str]] = []
+    with rx.session() as session:
+        chunks = session.exec(
+            sqlmodel.select(SpilledItems)
+            .where(SpilledItems.token == token)
+            .order_by(*_RESTORE_ORDERS[order])
+            .limit(count)
+        ).all()
+        for chunk in chunks:
+            items = codec.decode_items(chunk.payload)
+            needed = count - len(restored)
+            if newest:
+                taken, kept = items[-needed:], items[:-needed]
+                restored[:0] = taken
+            else:
+                taken, kept = items[:needed], items[needed:]
+                restored.extend(taken)
+            if kept:
+                chunk.payload = codec.encode_items(kept)
+                session.add(chunk)
+            else:
+                session.delete(chunk)
+            if len(restored) >= count:
+                break
+        if chunks:
+            _touch(session, token, time.time())
+        session.commit()
+    return restored
+
+
+class TodoRow(rx.Model, table=True):
+    """A single todo item owned by a session, used by the database engine."""
+
+    token: str = sqlmodel.Field(index=True)
+    text: str
+    priority: str
+
+
+class SeededSession(rx.Model, table=True):
+    """Marks a session whose default items the database engine has already stored."""
+
+    token: str = sqlmodel.Field(index=True, unique=True)
+
+
+def seed_rows(token: str, items: List[Dict[str, str]]) -> bool:
+    """Store a session's default items once; return whether they were stored now."""
+    with rx.session() as session:
+        seeded = session.exec(sqlmodel.select(SeededSession).where(SeededSession.token == token)).first()
+        if seeded is not None:
+            return False
+        session.add(SeededSession(token=token))
+        session.add_all(TodoRow(token=token, text=item["text"], priority=item["priority"]) for item in items)
+        session.commit()
+        return True
+
+
+def load_rows(token: str, limit: int = 0) -> List[Dict[str, str]]:
+    """Return a session's items in insertion order, at most `limit` of them when set."""
+    with rx.session() as session:
+        query = sqlmodel.select(TodoRow).where(TodoRow.token == token).order_by(TodoRow.id)
+        if limit:
+            query = query.limit(limit)
+        return [{"text": row.text, "priority": row.priority} for row in session.exec(query)]
+
+
+def add_rows(token: str, items: List[Dict[str, str]]) -> None:
+    """Store new items for a session."""
+    with rx.session() as session:
+        session.add_all(TodoRow(token=token, text=item["text"], priority=item["priority"]) for item in items)
+        session.commit()
+
+
+def delete_row(token: str, item: Dict[str, str]) -> None:
+    """Delete the oldest stored row matching an item."""
+    with rx.session() as session:
+        row = session.exec(
+            sqlmodel.select(TodoRow)
+            .where(TodoRow.token == token, TodoRow.text == item.get("text"), TodoRow.priority == item.get("priority"))
+            .order_by(TodoRow.id)
+        ).first()
+        if row is not None:
+            session.delete(row)
+            session.commit()